@@ -19,7 +19,8 @@ def add_sample_products():
             "price": 29.99,
             "category": "men",
             "image_url": "/images/products/men/mens-shirt-1.jpg",
-            "in_stock": True
+            "in_stock": True,
+            "stock": 50
         },
         {
             "name": "Blue Denim Jacket",
@@ -27,7 +28,8 @@ def add_sample_products():
             "price": 89.99,
             "category": "men",
             "image_url": "/images/products/men/mens-shirt-2.jpg",
-            "in_stock": True
+            "in_stock": True,
+            "stock": 50
         },
         {
             "name": "Casual Polo Shirt",
@@ -35,7 +37,8 @@ def add_sample_products():
             "price": 45.99,
             "category": "men",
             "image_url": "/images/products/men/mens-shirt-3.jpg",
-            "in_stock": True
+            "in_stock": True,
+            "stock": 50
         },
         {
             "name": "Striped Button-Up",
@@ -51,7 +54,8 @@ def add_sample_products():
             "price": 79.99,
             "category": "women",
             "image_url": "/images/products/women/womens-dress-1.jpg",
-            "in_stock": True
+            "in_stock": True,
+            "stock": 50
         },
         {
             "name": "Evening Gown",
@@ -59,7 +63,8 @@ def add_sample_products():
             "price": 149.99,
             "category": "women",
             "image_url": "/images/products/women/womens-dress-2.jpg",
-            "in_stock": True
+            "in_stock": True,
+            "stock": 50
         },
         {
             "name": "Casual Maxi Dress",
@@ -67,7 +72,8 @@ def add_sample_products():
             "price": 69.99,
             "category": "women",
             "image_url": "/images/products/women/womens-dress-3.jpg",
-            "in_stock": True
+            "in_stock": True,
+            "stock": 50
         },
         {
             "name": "Cocktail Dress",
@@ -75,7 +81,8 @@ def add_sample_products():
             "price": 119.99,
             "category": "women",
             "image_url": "/images/products/women/womens-dress-4.jpg",
-            "in_stock": True
+            "in_stock": True,
+            "stock": 50
         }
     ]
 
@@ -0,0 +1,90 @@
+# app/api/cart.py
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+from typing import List, Annotated
+
+from app.db.session import get_session
+from app.models.order import CartItem
+from app.models.product import Product
+from app.models.user import User
+from app.schemas.order import CartItemCreate, CartItemPublic
+from app.api.auth import get_current_user
+
+# -----------------------------
+# Create router
+# -----------------------------
+router = APIRouter()
+
+# -----------------------------
+# Helpers
+# -----------------------------
+def _find_cart_item(session: Session, user_id: int, product_id: int):
+    return session.exec(
+        select(CartItem).where(CartItem.user_id == user_id, CartItem.product_id == product_id)
+    ).first()
+
+# -----------------------------
+# Cart endpoints (all require authentication)
+# -----------------------------
+@router.get("/", response_model=List[CartItemPublic])
+def get_cart(
+    current_user: Annotated[User, Depends(get_current_user)],
+    session: Session = Depends(get_session)
+):
+    """Get the current user's cart"""
+    return session.exec(
+        select(CartItem).where(CartItem.user_id == current_user.id).order_by(CartItem.product_id)
+    ).all()
+
+@router.put("/items", response_model=CartItemPublic)
+def set_cart_item(
+    item_data: CartItemCreate,
+    current_user: Annotated[User, Depends(get_current_user)],
+    session: Session = Depends(get_session)
+):
+    """Add a product to the cart, or change its quantity"""
+    if not session.get(Product, item_data.product_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Product not found"
+        )
+
+    item = _find_cart_item(session, current_user.id, item_data.product_id)
+    if item:
+        item.quantity = item_data.quantity
+        session.add(item)
+        session.commit()
+    else:
+        item = CartItem(user_id=current_user.id, **item_data.model_dump())
+        session.add(item)
+        try:
+            session.commit()
+        except IntegrityError:
+            # A concurrent request added the same product first; update its row instead
+            session.rollback()
+            item = _find_cart_item(session, current_user.id, item_data.product_id)
+            item.quantity = item_data.quantity
+            session.add(item)
+            session.commit()
+
+    session.refresh(item)
+    return item
+
+@router.delete("/items/{product_id}")
+def remove_cart_item(
+    product_id: int,
+    current_user: Annotated[User, Depends(get_current_user)],
+    session: Session = Depends(get_session)
+):
+    """Remove a product from the cart"""
+    item = _find_cart_item(session, current_user.id, product_id)
+    if not item:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Product not in cart"
+        )
+
+    session.delete(item)
+    session.commit()
+    return {"message": "Item removed from cart"}
@@ -0,0 +1,175 @@
+# app/api/orders.py
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import delete, update
+from sqlmodel import Session, select
+from typing import Dict, List, Annotated
+from datetime import datetime, timedelta
+
+from app.db.session import get_session
+from app.models.order import CartItem, Order, OrderItem
+from app.models.product import Product
+from app.models.user import User
+from app.schemas.order import OrderItemPublic, OrderPublic
+from app.api.auth import get_current_user
+from app.core.config import settings
+from app.core.inventory import reserve_stock, restock_orders
+from app.core.queue import job_queue
+from app.jobs.orders import RELEASE_EXPIRED_RESERVATIONS
+
+# -----------------------------
+# Create router
+# -----------------------------
+router = APIRouter()
+
+# -----------------------------
+# Helpers
+# -----------------------------
+def _order_public(order: Order, items: List[OrderItem]) -> OrderPublic:
+    return OrderPublic(
+        id=order.id,
+        status=order.status,
+        total=order.total,
+        created_at=order.created_at,
+        expires_at=order.expires_at,
+        items=[
+            OrderItemPublic(product_id=i.product_id, quantity=i.quantity, unit_price=i.unit_price)
+            for i in items
+        ]
+    )
+
+def _get_user_order(session: Session, order_id: int, user: User) -> Order:
+    order = session.get(Order, order_id)
+    if not order or order.user_id != user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Order not found"
+        )
+    return order
+
+def _order_items(session: Session, order_ids: List[int]) -> Dict[int, List[OrderItem]]:
+    items: Dict[int, List[OrderItem]] = {order_id: [] for order_id in order_ids}
+    for item in session.exec(select(OrderItem).where(OrderItem.order_id.in_(order_ids))).all():
+        items[item.order_id].append(item)
+    return items
+
+def _transition(session: Session, order_id: int, user: User, new_status: str) -> bool:
+    """Move a live reservation to `new_status`. Conditional, so it can't race expiry or a second request."""
+    result = session.exec(
+        update(Order)
+        .where(
+            Order.id == order_id,
+            Order.user_id == user.id,
+            Order.status == "reserved",
+            Order.expires_at > datetime.utcnow()
+        )
+        .values(status=new_status)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+def _transition_failed(session: Session, order_id: int, user: User):
+    order = _get_user_order(session, order_id, user)
+    detail = "Reservation has expired" if order.status == "reserved" else f"Order is already {order.status}"
+    raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
+
+# -----------------------------
+# Order endpoints (all require authentication)
+# -----------------------------
+@router.post("/checkout", response_model=OrderPublic)
+def checkout(
+    current_user: Annotated[User, Depends(get_current_user)],
+    session: Session = Depends(get_session)
+):
+    """Reserve stock for everything in the cart and create an order"""
+    cart = session.exec(
+        select(CartItem).where(CartItem.user_id == current_user.id).order_by(CartItem.product_id)
+    ).all()
+    if not cart:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cart is empty"
+        )
+    wanted = [(item.product_id, item.quantity) for item in cart]
+
+    # Uncontended writes first, so hot product rows stay locked only briefly
+    order = Order(
+        user_id=current_user.id,
+        expires_at=datetime.utcnow() + timedelta(minutes=settings.RESERVATION_MINUTES)
+    )
+    session.add(order)
+    job_queue.enqueue(session, RELEASE_EXPIRED_RESERVATIONS, delay=settings.RESERVATION_MINUTES * 60)
+    session.flush()
+
+    # One conditional UPDATE per product, in product-id order to avoid deadlocks
+    items = []
+    for product_id, quantity in wanted:
+        unit_price = reserve_stock(session, product_id, quantity)
+        if unit_price is None:
+            session.rollback()
+            if session.get(Product, product_id) is None:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Product {product_id} is no longer available; remove it from your cart"
+                )
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Not enough stock for product {product_id}"
+            )
+        items.append(OrderItem(order_id=order.id, product_id=product_id, quantity=quantity, unit_price=unit_price))
+
+    order.total = round(sum(i.unit_price * i.quantity for i in items), 2)
+    session.add_all(items)
+    session.add(order)
+    session.exec(delete(CartItem).where(CartItem.user_id == current_user.id))
+    session.commit()
+    session.refresh(order)
+    return _order_public(order, items)
+
+@router.get("/", response_model=List[OrderPublic])
+def get_orders(
+    current_user: Annotated[User, Depends(get_current_user)],
+    session: Session = Depends(get_session),
+    skip: int = 0,
+    limit: int = 100
+):
+    """Get the current user's orders, newest first"""
+    orders = session.exec(
+        select(Order).where(Order.user_id == current_user.id).order_by(Order.id.desc()).offset(skip).limit(limit)
+    ).all()
+    items = _order_items(session, [order.id for order in orders])
+    return [_order_public(order, items[order.id]) for order in orders]
+
+@router.get("/{order_id}", response_model=OrderPublic)
+def get_order(
+    order_id: int,
+    current_user: Annotated[User, Depends(get_current_user)],
+    session: Session = Depends(get_session)
+):
+    """Get a specific order by ID"""
+    order = _get_user_order(session, order_id, current_user)
+    return _order_public(order, _order_items(session, [order.id])[order.id])
+
+@router.post("/{order_id}/confirm", response_model=OrderPublic)
+def confirm_order(
+    order_id: int,
+    current_user: Annotated[User, Depends(get_current_user)],
+    session: Session = Depends(get_session)
+):
+    """Confirm a reserved order, making the reservation permanent"""
+    if not _transition(session, order_id, current_user, "confirmed"):
+        _transition_failed(session, order_id, current_user)
+    session.commit()
+    return get_order(order_id, current_user, session)
+
+@router.post("/{order_id}/cancel", response_model=OrderPublic)
+def cancel_order(
+    order_id: int,
+    current_user: Annotated[User, Depends(get_current_user)],
+    session: Session = Depends(get_session)
+):
+    """Cancel a reserved order and release its stock"""
+    if not _transition(session, order_id, current_user, "cancelled"):
+        _transition_failed(session, order_id, current_user)
+    restock_orders(session, [order_id])
+    session.commit()
+    return get_order(order_id, current_user, session)
@@ -1,24 +1,46 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select, text
-from typing import List, Annotated
+from sqlalchemy import delete
+from sqlmodel import Session, select
+from typing import List, Annotated, Optional
 
-from app.db.session import get_session
+from app.db.session import get_session, get_read_session
+from app.models.order import CartItem
 from app.models.product import Product
 from app.schemas.product import ProductCreate, ProductPublic
 from app.api.auth import get_current_user
 from app.models.user import User
+from app.core.config import settings
+from app.core.events import catalog_stream
 
 # -----------------------------
 # Create router
 # -----------------------------
 router = APIRouter()
 
+# -----------------------------
+# `stock` is the source of truth and `in_stock` is derived from it. Clients
+# that only send `in_stock` (e.g. older product forms) still work: marking a
+# product out of stock empties it, marking it in stock keeps its current count
+# or gives it DEFAULT_STOCK units. Sending neither keeps the current stock.
+# -----------------------------
+def _product_fields(product_data: ProductCreate, current_stock: Optional[int] = None) -> dict:
+    fields = product_data.model_dump(exclude={"stock", "in_stock"})
+    stock = product_data.stock
+    if stock is None:
+        in_stock = product_data.in_stock
+        if in_stock is None:
+            in_stock = current_stock is None or current_stock > 0  # new products start in stock
+        stock = (current_stock or settings.DEFAULT_STOCK) if in_stock else 0
+    fields["stock"] = stock
+    fields["in_stock"] = stock > 0
+    return fields
+
 # -----------------------------
 # Product endpoints
 # -----------------------------
 @router.get("/", response_model=List[ProductPublic])
 def get_products(
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     skip: int = 0,
     limit: int = 100
 ):
@@ -29,7 +51,7 @@ def get_products(
 @router.get("/{product_id}", response_model=ProductPublic)
 def get_product(
     product_id: int,
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_read_session)
 ):
     """Get a specific product by ID"""
     product = session.get(Product, product_id)
@@ -47,16 +69,16 @@ def create_product(
     session: Session = Depends(get_session)
 ):
     """Create a new product (requires authentication)"""
-    
-    # FIX: Sync the PostgreSQL sequence to prevent "duplicate key" errors
-    # This ensures the next ID generated matches the current table state.
-    session.exec(text(
-        "SELECT setval(pg_get_serial_sequence('product', 'id'), coalesce(max(id), 0) + 1, false) FROM product"
-    ))
-    
     # Use model_dump() instead of dict() for Pydantic v2 compatibility
-    product = Product(**product_data.model_dump())
+    product = Product(**_product_fields(product_data))
     session.add(product)
+    session.flush()  # assign the id for the live-update diff
+    catalog_stream.record(session, {
+        "op": "create",
+        "id": product.id,
+        "category": product.category,
+        "product": ProductPublic.model_validate(product, from_attributes=True).model_dump()
+    })
     session.commit()
     session.refresh(product)
     return product
@@ -77,10 +99,19 @@ def update_product(
         )
 
     # Update product fields using modern model_dump()
-    product_dict = product_data.model_dump()
-    for field, value in product_dict.items():
+    product_dict = _product_fields(product_data, current_stock=product.stock)
+    changes = {field: value for field, value in product_dict.items() if getattr(product, field) != value}
+    previous_category = product.category
+    for field, value in changes.items():
         setattr(product, field, value)
 
+    if changes:
+        catalog_stream.record(session, {
+            "op": "update",
+            "id": product.id,
+            "category": product.category,
+            "changes": changes
+        }, previous_category=previous_category)
     session.add(product)
     session.commit()
     session.refresh(product)
@@ -100,6 +131,9 @@ def delete_product(
             detail="Product not found"
         )
 
+    catalog_stream.record(session, {"op": "delete", "id": product.id, "category": product.category})
+    # Nothing references carts by FK, so clear them here or checkouts would fail on the missing row
+    session.exec(delete(CartItem).where(CartItem.product_id == product.id))
     session.delete(product)
     session.commit()
     return {"message": "Product deleted successfully"}
\ No newline at end of file
@@ -0,0 +1,67 @@
+# app/api/stream.py
+import asyncio
+import json
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+
+from app.core.events import catalog_stream
+
+# -----------------------------
+# Create router
+# (mounted under /products ahead of the product routes, so "stream" is not
+# taken for a product id)
+# -----------------------------
+router = APIRouter()
+
+# -----------------------------
+# Live catalog endpoints
+# -----------------------------
+@router.get("/stream")
+async def stream_products(category: Optional[List[str]] = Query(None)):
+    """Server-sent events with product diffs as they are committed.
+
+    Subscribe to specific categories with ?category=men&category=women. A
+    `resync` event means updates were dropped and the client should refetch.
+    """
+    subscriber = catalog_stream.subscribe(category)
+
+    async def events():
+        try:
+            yield "retry: 3000\n\n"
+            async for batch in catalog_stream.batches(subscriber):
+                if batch is None:
+                    yield ": ping\n\n"
+                else:
+                    yield f"event: {batch['event']}\ndata: {json.dumps(batch['data'], separators=(',', ':'))}\n\n"
+        finally:
+            catalog_stream.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.websocket("/stream/ws")
+async def stream_products_ws(websocket: WebSocket, category: Optional[List[str]] = Query(None)):
+    """WebSocket variant of /products/stream; sends {"event", "data"} JSON messages."""
+    await websocket.accept()
+    subscriber = catalog_stream.subscribe(category)
+
+    async def send_batches():
+        try:
+            async for batch in catalog_stream.batches(subscriber):
+                await websocket.send_json(batch or {"event": "ping", "data": {}})
+        except WebSocketDisconnect:
+            pass
+
+    sender = asyncio.create_task(send_batches())
+    try:
+        # Clients send nothing, but reading is what notices a close right
+        # away instead of at the next heartbeat
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+    finally:
+        sender.cancel()
+        catalog_stream.unsubscribe(subscriber)
@@ -0,0 +1,120 @@
+# app/core/broker.py
+import importlib
+import json
+import logging
+import select
+import threading
+from typing import Callable, Optional
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+
+# -----------------------------
+# Message brokers for catalog events.
+# A broker carries committed changes to every worker process; each worker then
+# fans them out to its own connected clients. Brokers deliver JSON-able dicts.
+#
+# Non-transactional brokers get publish(message) after the commit.
+# Transactional brokers (transactional = True) get publish(message, connection)
+# just before the commit, on the writer's own connection, so delivery is tied
+# to the commit and no second pooled connection is needed.
+# Brokers with a payload limit set by_reference = True: they are handed compact
+# references (op, id, category, changed field names) and receivers load the
+# current values from the database.
+# -----------------------------
+class InProcessBroker:
+    """Default broker: delivers straight to this process (single worker)."""
+
+    transactional = False
+
+    def __init__(self, engine=None):
+        self._deliver: Optional[Callable[[dict], None]] = None
+
+    def start(self, deliver: Callable[[dict], None]):
+        self._deliver = deliver
+
+    def publish(self, message: dict):
+        if self._deliver is not None:
+            self._deliver(message)
+
+    def stop(self):
+        self._deliver = None
+
+
+class PostgresBroker:
+    """Fan out across workers with PostgreSQL LISTEN/NOTIFY on the primary database."""
+
+    channel = "catalog_events"
+    transactional = True
+    by_reference = True
+    max_payload = 7999  # PostgreSQL rejects NOTIFY payloads of 8000 bytes or more
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._deliver: Optional[Callable[[dict], None]] = None
+        self._stopping = threading.Event()
+        self._listener: Optional[threading.Thread] = None
+
+    def start(self, deliver: Callable[[dict], None]):
+        self._deliver = deliver
+        self._stopping.clear()
+        self._listener = threading.Thread(target=self._listen_loop, name="catalog-listener", daemon=True)
+        self._listener.start()
+
+    def publish(self, message: dict, connection):
+        # NOTIFY is transactional: PostgreSQL delivers it only if the writer's
+        # transaction commits. References are small, but a catalog write must
+        # never fail because of its notification, so oversized ones are dropped.
+        payload = json.dumps(message)
+        if len(payload.encode()) > self.max_payload:
+            logger.warning("Catalog event of %d bytes is too large for NOTIFY; not sent", len(payload.encode()))
+            return
+        connection.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": self.channel, "payload": payload}
+        )
+
+    def _listen_loop(self):
+        while not self._stopping.is_set():
+            try:
+                # A dedicated connection outside the pool, so LISTEN never ties up a request slot
+                cargs, cparams = self.engine.dialect.create_connect_args(self.engine.url)
+                dbapi_connection = self.engine.dialect.connect(*cargs, **cparams)
+                try:
+                    dbapi_connection.autocommit = True
+                    dbapi_connection.cursor().execute(f"LISTEN {self.channel}")
+                    while not self._stopping.is_set():
+                        if select.select([dbapi_connection], [], [], 1.0) == ([], [], []):
+                            continue
+                        dbapi_connection.poll()
+                        while dbapi_connection.notifies:
+                            notify = dbapi_connection.notifies.pop(0)
+                            self._deliver(json.loads(notify.payload))
+                finally:
+                    dbapi_connection.close()
+            except Exception:
+                logger.exception("Catalog listener lost its connection; reconnecting")
+                self._stopping.wait(1.0)
+
+    def stop(self):
+        self._stopping.set()
+        if self._listener is not None:
+            self._listener.join()
+            self._listener = None
+
+
+BROKERS = {
+    "memory": InProcessBroker,
+    "postgres": PostgresBroker,
+}
+
+def load_broker(name: str, engine):
+    """Build a broker from a short name or a "package.module:ClassName" path."""
+    if name in BROKERS:
+        return BROKERS[name](engine)
+    module_name, _, class_name = name.partition(":")
+    if not class_name:
+        raise ValueError(f"Unknown event broker '{name}'")
+    return getattr(importlib.import_module(module_name), class_name)(engine)
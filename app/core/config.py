@@ -6,12 +6,36 @@ class Settings(BaseSettings):
     # Database URL (from .env) - Force SQLite for development
     DATABASE_URL: str = "sqlite:///./myazam_db.db"
 
+    # Read replicas (comma-separated URLs); read-only routes use the primary when empty
+    DATABASE_REPLICA_URLS: str = ""
+    REPLICA_STRATEGY: str = "round_robin"  # round_robin or least_loaded
+    REPLICA_STICKY_SECONDS: float = 5.0  # reads stay on the primary this long after a client's write
+    REPLICA_RETRY_SECONDS: float = 30.0  # how long a failed replica is skipped
+
     # Secret key for JWT tokens
     SECRET_KEY: str = "supersecretkey1234567890"  # CHANGE for production
 
     # Token expiry in minutes
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 120
 
+    # Checkout: how long reserved stock is held before it is released
+    RESERVATION_MINUTES: int = 15
+    # Units given to a product marked in stock without a count (older clients, upgraded databases)
+    DEFAULT_STOCK: int = 50
+
+    # Live catalog stream (/products/stream)
+    EVENT_BROKER: str = "memory"  # memory, postgres, or "package.module:ClassName"
+    STREAM_COALESCE_SECONDS: float = 0.25  # updates within this window go out as one batch
+    STREAM_MAX_PENDING: int = 500  # products buffered per slow client before it must resync
+    STREAM_HEARTBEAT_SECONDS: float = 15.0
+
+    # Background job queue
+    JOBS_EAGER: bool = False  # run jobs inline on commit instead of in workers (tests)
+    JOB_WORKERS: int = 4
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_POLL_INTERVAL: float = 1.0  # seconds between outbox polls when idle
+    JOB_LEASE_SECONDS: int = 300  # a claimed job is retried if not finished in time
+
     class Config:
         # Tell Pydantic to load from .env if it exists
         env_file = ".env"
@@ -0,0 +1,226 @@
+# app/core/events.py
+import asyncio
+import logging
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.core.broker import load_broker
+from app.core.config import settings
+from app.db.session import engine
+from app.models.product import Product
+from app.schemas.product import ProductPublic
+
+logger = logging.getLogger(__name__)
+
+
+# -----------------------------
+# Diff helpers
+# Diffs are compact: {"op": "create", "id", "category", "product": {...}},
+# {"op": "update", "id", "category", "changes": {...}} or {"op": "delete", "id", "category"}.
+# -----------------------------
+def merge_diffs(old: dict, new: dict) -> dict:
+    """Collapse two diffs for the same product into the one a client needs."""
+    if new["op"] == "update" and old["op"] in ("create", "update"):
+        key = "product" if old["op"] == "create" else "changes"
+        return {**old, "category": new["category"], key: {**old[key], **new["changes"]}}
+    return new
+
+
+def to_reference(message: dict) -> dict:
+    """Strip field values from a message, keeping only what changed.
+
+    Used for brokers with a payload limit (PostgreSQL NOTIFY caps payloads at
+    8000 bytes, and descriptions are unbounded). Receivers fill the values back
+    in from the database with from_reference().
+    """
+    diff = message["diff"]
+    reference = {"op": diff["op"], "id": diff["id"], "category": diff["category"]}
+    if diff["op"] == "update":
+        reference["fields"] = sorted(diff["changes"])
+    return {"categories": message["categories"], "diff": reference}
+
+def from_reference(session: Session, message: dict) -> dict:
+    """Rebuild a full message from to_reference() with the product's current values."""
+    diff = message["diff"]
+    if diff["op"] == "delete":
+        return message
+    product = session.get(Product, diff["id"])
+    if product is None:
+        # Deleted since; its own delete message follows
+        return {**message, "diff": {"op": "delete", "id": diff["id"], "category": diff["category"]}}
+    if diff["op"] == "create":
+        values = {"product": ProductPublic.model_validate(product, from_attributes=True).model_dump()}
+    else:
+        values = {"changes": {field: getattr(product, field) for field in diff["fields"]}}
+    return {**message, "diff": {"op": diff["op"], "id": product.id, "category": product.category, **values}}
+
+
+class Subscriber:
+    __slots__ = ("categories", "pending", "overflowed", "wakeup")
+
+    def __init__(self, categories: Optional[Set[str]]):
+        self.categories = categories  # None means every category
+        self.pending: Dict[int, dict] = {}  # product id -> coalesced diff
+        self.overflowed = False
+        self.wakeup = asyncio.Event()
+
+
+# -----------------------------
+# Live catalog stream.
+# Writers record diffs on their session; on commit they go to the broker,
+# which hands them to every worker's hub. The hub runs on the event loop and
+# keeps at most one pending diff per product per client, so bursts coalesce and
+# a slow client costs bounded memory: past STREAM_MAX_PENDING products it is
+# told to resync instead of being buffered further.
+# -----------------------------
+class CatalogStream:
+    def __init__(
+        self,
+        broker,
+        coalesce_seconds: float = 0.25,
+        max_pending: int = 500,
+        heartbeat_seconds: float = 15.0,
+    ):
+        self.broker = broker
+        self.coalesce_seconds = coalesce_seconds
+        self.max_pending = max_pending
+        self.heartbeat_seconds = heartbeat_seconds
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._by_category: Dict[Optional[str], Set[Subscriber]] = {}
+
+        event.listen(Session, "before_commit", self._before_commit)
+        event.listen(Session, "after_commit", self._after_commit)
+        event.listen(Session, "after_rollback", self._after_rollback)
+
+    # -----------------------------
+    # Producer side (any thread)
+    # -----------------------------
+    def record(self, session: Session, diff: dict, previous_category: Optional[str] = None):
+        """Queue a diff on the session; it is published only if the transaction commits."""
+        categories = {diff["category"]}
+        if previous_category is not None:
+            categories.add(previous_category)
+        session.info.setdefault("catalog_events", []).append(
+            {"categories": sorted(categories), "diff": diff}
+        )
+
+    def _before_commit(self, session):
+        # Transactional brokers publish inside the writer's transaction, on the
+        # connection the session already holds
+        if not getattr(self.broker, "transactional", False):
+            return
+        messages = session.info.pop("catalog_events", ())
+        if messages:
+            connection = session.connection()
+            for message in messages:
+                self.broker.publish(self._outgoing(message), connection)
+
+    def _after_commit(self, session):
+        # Everything else is published once the data is committed
+        for message in session.info.pop("catalog_events", ()):
+            try:
+                self.broker.publish(self._outgoing(message))
+            except Exception:
+                logger.exception("Failed to publish catalog event")
+
+    def _after_rollback(self, session):
+        session.info.pop("catalog_events", None)
+
+    def _outgoing(self, message: dict) -> dict:
+        return to_reference(message) if getattr(self.broker, "by_reference", False) else message
+
+    def _deliver(self, message: dict):
+        # Called by the broker from whatever thread it runs on, so loading
+        # referenced rows here never blocks the event loop
+        if self._loop is None:
+            return
+        if getattr(self.broker, "by_reference", False):
+            try:
+                with Session(engine) as session:
+                    message = from_reference(session, message)
+            except Exception:
+                logger.exception("Failed to load catalog event for product %s", message["diff"]["id"])
+                return
+        self._loop.call_soon_threadsafe(self._fan_out, message)
+
+    # -----------------------------
+    # Consumer side (event loop)
+    # -----------------------------
+    def _fan_out(self, message: dict):
+        diff = message["diff"]
+        targets = set(self._by_category.get(None, ()))
+        for category in message["categories"]:
+            targets.update(self._by_category.get(category, ()))
+
+        for subscriber in targets:
+            if subscriber.overflowed:
+                continue
+            previous = subscriber.pending.get(diff["id"])
+            subscriber.pending[diff["id"]] = merge_diffs(previous, diff) if previous else diff
+            if len(subscriber.pending) > self.max_pending:
+                subscriber.overflowed = True
+                subscriber.pending.clear()
+            subscriber.wakeup.set()
+
+    def subscribe(self, categories: Optional[Iterable[str]] = None) -> Subscriber:
+        subscriber = Subscriber(set(categories) if categories else None)
+        for key in subscriber.categories or (None,):
+            self._by_category.setdefault(key, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        for key in subscriber.categories or (None,):
+            subscribers = self._by_category.get(key)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._by_category[key]
+
+    async def batches(self, subscriber: Subscriber) -> AsyncIterator[Optional[dict]]:
+        """Yield {"event": ..., "data": ...} batches for a subscriber, or None as a heartbeat.
+
+        The next batch is only assembled once the previous one has been sent,
+        so a slow client never has more than one batch in flight.
+        """
+        while True:
+            try:
+                # asyncio.timeout (3.11+) waits without an extra task per idle client
+                async with asyncio.timeout(self.heartbeat_seconds):
+                    await subscriber.wakeup.wait()
+            except TimeoutError:
+                yield None
+                continue
+
+            await asyncio.sleep(self.coalesce_seconds)  # let a burst collapse
+            subscriber.wakeup.clear()
+            if subscriber.overflowed:
+                subscriber.overflowed = False
+                yield {"event": "resync", "data": {}}
+                continue
+            diffs: List[dict] = list(subscriber.pending.values())
+            subscriber.pending.clear()
+            if diffs:
+                yield {"event": "products", "data": diffs}
+
+    # -----------------------------
+    # Lifecycle
+    # -----------------------------
+    def start(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self.broker.start(self._deliver)
+
+    def stop(self):
+        self.broker.stop()
+        self._loop = None
+
+
+# Create a global stream object
+catalog_stream = CatalogStream(
+    load_broker(settings.EVENT_BROKER, engine),
+    coalesce_seconds=settings.STREAM_COALESCE_SECONDS,
+    max_pending=settings.STREAM_MAX_PENDING,
+    heartbeat_seconds=settings.STREAM_HEARTBEAT_SECONDS,
+)
@@ -0,0 +1,84 @@
+# app/core/inventory.py
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func, update
+from sqlmodel import Session, select
+
+from app.core.events import catalog_stream
+from app.models.order import Order, OrderItem
+from app.models.product import Product
+
+# -----------------------------
+# Stock reservation.
+# Every change to Product.stock is a single conditional UPDATE, so the database
+# serialises concurrent checkouts on the row itself: no read-modify-write, no
+# oversell, and no lock held across round trips.
+# -----------------------------
+def _record_stock(session: Session, row):
+    """Tell live catalog clients about the new stock level once this commits."""
+    catalog_stream.record(session, {
+        "op": "update",
+        "id": row.id,
+        "category": row.category,
+        "changes": {"stock": row.stock, "in_stock": row.in_stock}
+    })
+
+def reserve_stock(session: Session, product_id: int, quantity: int) -> Optional[float]:
+    """Take `quantity` units of a product. Returns its unit price, or None if there isn't enough stock."""
+    result = session.exec(
+        update(Product)
+        .where(Product.id == product_id, Product.stock >= quantity)
+        .values(stock=Product.stock - quantity, in_stock=Product.stock - quantity > 0)
+        .returning(Product.id, Product.price, Product.stock, Product.in_stock, Product.category)
+        .execution_options(synchronize_session=False)
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
+    _record_stock(session, row)
+    return row.price
+
+def release_stock(session: Session, quantities: Dict[int, int]):
+    """Put units back on the shelf, e.g. {product_id: quantity}."""
+    # Lock rows in a fixed order so concurrent releases can't deadlock
+    for product_id in sorted(quantities):
+        row = session.exec(
+            update(Product)
+            .where(Product.id == product_id)
+            .values(
+                stock=Product.stock + quantities[product_id],
+                in_stock=Product.stock + quantities[product_id] > 0
+            )
+            .returning(Product.id, Product.stock, Product.in_stock, Product.category)
+            .execution_options(synchronize_session=False)
+        ).one_or_none()
+        if row is not None:
+            _record_stock(session, row)
+
+def restock_orders(session: Session, order_ids: Iterable[int]):
+    """Release the stock held by the given orders, one UPDATE per product."""
+    order_ids = list(order_ids)
+    if not order_ids:
+        return
+    rows = session.exec(
+        select(OrderItem.product_id, func.sum(OrderItem.quantity))
+        .where(OrderItem.order_id.in_(order_ids))
+        .group_by(OrderItem.product_id)
+    ).all()
+    release_stock(session, {product_id: quantity for product_id, quantity in rows})
+
+def release_expired_reservations(session: Session, now: Optional[datetime] = None) -> List[int]:
+    """Expire every overdue reservation in bulk and return the expired order ids."""
+    now = now or datetime.utcnow()
+    # The status guard means an order confirmed or cancelled concurrently is
+    # never released twice.
+    expired = session.exec(
+        update(Order)
+        .where(Order.status == "reserved", Order.expires_at <= now)
+        .values(status="expired")
+        .returning(Order.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    restock_orders(session, expired)
+    return expired
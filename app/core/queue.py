@@ -0,0 +1,260 @@
+# app/core/queue.py
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import and_, event, func, or_, update
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.db.session import engine
+from app.models.job import Job
+
+logger = logging.getLogger(__name__)
+
+
+# -----------------------------
+# In-process job queue backed by a database outbox.
+# Jobs are rows in the `job` table, written in the same transaction as the
+# change that caused them, so a rolled-back write never leaves work behind.
+# A dispatcher thread claims due rows and hands them to a bounded worker pool.
+# -----------------------------
+class JobQueue:
+    def __init__(
+        self,
+        engine,
+        workers: int = 4,
+        max_attempts: int = 5,
+        poll_interval: float = 1.0,
+        lease_seconds: int = 300,
+        eager: bool = False,
+    ):
+        self.engine = engine
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.eager = eager
+        self.handlers: Dict[str, Callable] = {}
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._dispatcher: Optional[threading.Thread] = None
+        self._local = threading.local()  # per-thread: is run_pending already draining here?
+        self._in_flight = 0
+        self._counters = {"processed": 0, "retried": 0, "failed": 0}
+
+        # Kick the queue as soon as a transaction that enqueued work commits
+        event.listen(Session, "after_commit", self._after_commit)
+        event.listen(Session, "after_rollback", self._after_rollback)
+
+    # -----------------------------
+    # Producer API
+    # -----------------------------
+    def register(self, name: str):
+        """Register a handler for a job name. Handlers receive (session, **payload)."""
+        def decorator(func: Callable) -> Callable:
+            self.handlers[name] = func
+            return func
+        return decorator
+
+    def enqueue(self, session: Session, name: str, delay: float = 0, **payload) -> Job:
+        """Add a job to the caller's transaction; it becomes visible on commit."""
+        if name not in self.handlers:
+            raise ValueError(f"No handler registered for job '{name}'")
+
+        job = Job(
+            name=name,
+            payload=json.dumps(payload),
+            max_attempts=self.max_attempts,
+            run_after=datetime.utcnow() + timedelta(seconds=delay),
+        )
+        session.add(job)
+        session.info["jobs_enqueued"] = True
+        return job
+
+    def _after_commit(self, session):
+        if not session.info.pop("jobs_enqueued", False):
+            return
+        if self.eager:
+            self.run_pending()
+        else:
+            self._wakeup.set()
+
+    def _after_rollback(self, session):
+        session.info.pop("jobs_enqueued", None)
+
+    # -----------------------------
+    # Consumer side
+    # -----------------------------
+    def _due(self, now: datetime):
+        # Pending jobs whose delay has passed, plus running jobs whose lease
+        # expired (the worker that claimed them died).
+        return or_(
+            and_(Job.status == "pending", Job.run_after <= now),
+            and_(Job.status == "running", Job.locked_until < now),
+        )
+
+    def _claim(self, limit: int) -> List[int]:
+        """Atomically mark up to `limit` due jobs as running and return their ids."""
+        now = datetime.utcnow()
+        claimed = []
+        with Session(self.engine) as session:
+            candidates = session.exec(
+                select(Job.id).where(self._due(now)).order_by(Job.run_after).limit(limit)
+            ).all()
+            for job_id in candidates:
+                # Conditional UPDATE so two dispatchers (e.g. two uvicorn
+                # workers) can never claim the same row.
+                result = session.exec(
+                    update(Job)
+                    .where(Job.id == job_id, self._due(now))
+                    .values(
+                        status="running",
+                        attempts=Job.attempts + 1,
+                        locked_until=now + timedelta(seconds=self.lease_seconds),
+                    )
+                )
+                if result.rowcount == 1:
+                    claimed.append(job_id)
+            session.commit()
+        return claimed
+
+    def _execute(self, job_id: int):
+        """Run one claimed job. Success deletes the row; failure schedules a retry."""
+        with Session(self.engine) as session:
+            job = session.get(Job, job_id)
+            if job is None:
+                return
+            try:
+                handler = self.handlers.get(job.name)
+                if handler is None:
+                    raise LookupError(f"No handler registered for job '{job.name}'")
+                handler(session, **json.loads(job.payload))
+                # Handler side effects and outbox removal commit together
+                session.delete(job)
+                session.commit()
+                self._count("processed")
+            except Exception as exc:
+                logger.exception("Job %s (%s) failed", job_id, job.name)
+                session.rollback()
+                job = session.get(Job, job_id)
+                if job is None:
+                    return  # our lease expired and another worker finished it
+                job.last_error = repr(exc)[:1000]
+                job.locked_until = None
+                if job.attempts >= job.max_attempts:
+                    job.status = "failed"
+                    job.finished_at = datetime.utcnow()
+                    self._count("failed")
+                else:
+                    # Exponential backoff, capped at five minutes
+                    job.status = "pending"
+                    job.run_after = datetime.utcnow() + timedelta(seconds=min(2 ** job.attempts, 300))
+                    self._count("retried")
+                session.add(job)
+                session.commit()
+
+    def _count(self, key: str):
+        with self._lock:
+            self._counters[key] += 1
+
+    def run_pending(self) -> int:
+        """Synchronously run every due job in the calling thread (eager mode, scripts, tests)."""
+        if getattr(self._local, "draining", False):
+            return 0  # a handler enqueued more work; the outer loop picks it up
+        self._local.draining = True
+        ran = 0
+        try:
+            while True:
+                job_ids = self._claim(1)
+                if not job_ids:
+                    return ran
+                self._execute(job_ids[0])
+                ran += 1
+        finally:
+            self._local.draining = False
+
+    def _run_in_worker(self, job_id: int):
+        try:
+            self._execute(job_id)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._wakeup.set()  # a slot freed up
+
+    def _dispatch_loop(self):
+        while not self._stopping.is_set():
+            self._wakeup.clear()
+            try:
+                with self._lock:
+                    free = self.workers - self._in_flight
+                for job_id in self._claim(free) if free > 0 else []:
+                    with self._lock:
+                        self._in_flight += 1
+                    self._executor.submit(self._run_in_worker, job_id)
+            except Exception:
+                logger.exception("Job dispatcher failed to claim work")
+            self._wakeup.wait(self.poll_interval)
+
+    # -----------------------------
+    # Lifecycle
+    # -----------------------------
+    def start(self):
+        if self.eager or self._dispatcher is not None:
+            return
+        self._stopping.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="job-worker")
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="job-dispatcher", daemon=True)
+        self._dispatcher.start()
+
+    def stop(self):
+        if self._dispatcher is None:
+            return
+        self._stopping.set()
+        self._wakeup.set()
+        self._dispatcher.join()
+        self._executor.shutdown(wait=True)
+        self._dispatcher = None
+        self._executor = None
+
+    # -----------------------------
+    # Metrics
+    # -----------------------------
+    def stats(self) -> dict:
+        """Queue depth, lag (age of the oldest due job) and this process's lifetime counters."""
+        now = datetime.utcnow()
+        with Session(self.engine) as session:
+            counts = dict(session.exec(
+                select(Job.status, func.count()).group_by(Job.status)
+            ).all())
+            oldest = session.exec(
+                select(func.min(Job.run_after)).where(Job.status == "pending", Job.run_after <= now)
+            ).one()
+
+        with self._lock:
+            return {
+                "depth": counts.get("pending", 0),
+                "running": counts.get("running", 0),
+                "failed": counts.get("failed", 0),
+                "lag_seconds": round((now - oldest).total_seconds(), 3) if oldest else 0.0,
+                "in_flight": self._in_flight,
+                "workers": self.workers,
+                "counters": dict(self._counters),
+            }
+
+
+# Create a global queue object
+job_queue = JobQueue(
+    engine,
+    workers=settings.JOB_WORKERS,
+    max_attempts=settings.JOB_MAX_ATTEMPTS,
+    poll_interval=settings.JOB_POLL_INTERVAL,
+    lease_seconds=settings.JOB_LEASE_SECONDS,
+    eager=settings.JOBS_EAGER,
+)
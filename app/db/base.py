@@ -1,7 +1,53 @@
 # app/db/base.py
-from sqlmodel import SQLModel
+from sqlalchemy import inspect
+from sqlalchemy.exc import DBAPIError
+from sqlmodel import SQLModel, Session, text
+from app.core.config import settings
 from app.models.user import User
 from app.models.product import Product
+from app.models.order import CartItem, Order, OrderItem
+from app.models.job import Job
 
 def create_db_and_tables(engine):
     SQLModel.metadata.create_all(engine)
+
+def add_missing_columns(engine):
+    """Add columns introduced after a table was first created.
+
+    create_all() only creates missing tables, so databases created before
+    Product.stock existed get the column added in place. Safe to run on
+    every startup, including from several workers at once.
+    """
+    if "stock" in {column["name"] for column in inspect(engine).get_columns("product")}:
+        return
+    try:
+        with engine.begin() as connection:
+            connection.execute(text("ALTER TABLE product ADD COLUMN stock INTEGER NOT NULL DEFAULT 0"))
+            # Products that were on sale keep selling: give them a default count
+            connection.execute(
+                text("UPDATE product SET stock = :stock WHERE in_stock"),
+                {"stock": settings.DEFAULT_STOCK}
+            )
+    except DBAPIError:
+        # Another worker may have added it first
+        if "stock" not in {column["name"] for column in inspect(engine).get_columns("product")}:
+            raise
+
+def sync_sequences(engine):
+    """Move the PostgreSQL product id sequence past rows inserted with explicit ids.
+
+    Migrations and restores (e.g. migrate_sqlite_to_postgres.py) leave the
+    sequence behind, which makes the next insert fail with "duplicate key".
+    The sequence only ever moves forward, so ids already handed out stay
+    unique. SQLite has no sequence, so this is a no-op there.
+    """
+    if engine.dialect.name != "postgresql":
+        return
+    with Session(engine) as session:
+        session.exec(text(
+            "SELECT setval(seq.name, product_max.id) "
+            "FROM (SELECT pg_get_serial_sequence('product', 'id')::regclass AS name) seq, "
+            "(SELECT max(id) AS id FROM product) product_max "
+            "WHERE product_max.id > coalesce(pg_sequence_last_value(seq.name), 0)"
+        ))
+        session.commit()
@@ -1,15 +1,174 @@
 # app/db/session.py
+import itertools
+import threading
+import time
+from typing import Dict, List, Optional
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
 from sqlmodel import create_engine, Session, SQLModel
 from app.core.config import settings
+from app.core.security import verify_access_token
+
+def _create_engine(url: str, **kwargs):
+    return create_engine(
+        url,
+        echo=True,  # Shows SQL statements in console (useful for development)
+        connect_args={"check_same_thread": False} if url.startswith("sqlite") else {},
+        **kwargs
+    )
+
+# Create the SQLModel engine (primary: all writes go here)
+engine = _create_engine(settings.DATABASE_URL)
+
+# Read replicas for read-only routes
+# (pre-ping so a replica that went down fails in connect() and we fail over,
+# instead of handing out its dead pooled connections)
+replica_engines = [
+    _create_engine(url.strip(), pool_pre_ping=True)
+    for url in settings.DATABASE_REPLICA_URLS.split(",")
+    if url.strip()
+]
+
+
+# -----------------------------
+# Replica selection, failover and read-your-writes stickiness
+# -----------------------------
+class ReplicaRouter:
+    def __init__(
+        self,
+        primary,
+        replicas: List,
+        strategy: str = "round_robin",
+        sticky_seconds: float = 5.0,
+        retry_seconds: float = 30.0,
+    ):
+        if strategy not in ("round_robin", "least_loaded"):
+            raise ValueError(f"Unknown replica strategy '{strategy}'")
+        self.primary = primary
+        self.replicas = replicas
+        self.strategy = strategy
+        self.sticky_seconds = sticky_seconds
+        self.retry_seconds = retry_seconds
+
+        self._lock = threading.Lock()
+        self._turn = itertools.count()
+        self._in_use: Dict[int, int] = {id(r): 0 for r in replicas}
+        self._down_until: Dict[int, float] = {}
+        self._recent_writers: Dict[str, float] = {}
+
+    def mark_write(self, client_key: str):
+        """Pin this client's reads to the primary until replicas have caught up."""
+        now = time.monotonic()
+        with self._lock:
+            self._recent_writers[client_key] = now + self.sticky_seconds
+            if len(self._recent_writers) > 10000:
+                self._recent_writers = {k: t for k, t in self._recent_writers.items() if t > now}
+
+    def is_sticky(self, client_key: str) -> bool:
+        with self._lock:
+            expires = self._recent_writers.get(client_key)
+            if expires is None:
+                return False
+            if expires <= time.monotonic():
+                del self._recent_writers[client_key]
+                return False
+            return True
+
+    def _candidates(self) -> List:
+        """Healthy replicas in preference order for this request."""
+        now = time.monotonic()
+        with self._lock:
+            healthy = [r for r in self.replicas if self._down_until.get(id(r), 0) <= now]
+            if not healthy:
+                return []
+            start = next(self._turn) % len(healthy)
+            ordered = healthy[start:] + healthy[:start]
+            if self.strategy == "least_loaded":
+                # Stable sort keeps the round-robin order among equally loaded replicas
+                ordered.sort(key=lambda r: self._in_use[id(r)])
+            return ordered
+
+    def connect(self):
+        """Return (engine, connection), trying replicas first and falling back to the primary."""
+        for replica in self._candidates():
+            try:
+                connection = replica.connect()
+            except DBAPIError:
+                with self._lock:
+                    self._down_until[id(replica)] = time.monotonic() + self.retry_seconds
+                continue
+            with self._lock:
+                self._in_use[id(replica)] += 1
+            return replica, connection
+        return self.primary, self.primary.connect()
 
-# Create the SQLModel engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    echo=True,  # Shows SQL statements in console (useful for development)
-    connect_args={"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {}
+    def release(self, replica):
+        with self._lock:
+            if id(replica) in self._in_use:
+                self._in_use[id(replica)] -= 1
+
+
+replica_router = ReplicaRouter(
+    engine,
+    replica_engines,
+    strategy=settings.REPLICA_STRATEGY,
+    sticky_seconds=settings.REPLICA_STICKY_SECONDS,
+    retry_seconds=settings.REPLICA_RETRY_SECONDS,
 )
 
+
+# Identify a client for read-your-writes by the user id in its token.
+# Anonymous clients aren't tracked: behind the proxy they all share one
+# address, so one visitor's write would pin everyone's reads to the primary.
+def client_key(request: Request) -> Optional[str]:
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    payload = verify_access_token(token)
+    user_id = payload.get("user_id") if payload else None
+    return str(user_id) if user_id else None
+
+
+# Remember who committed changes so their next reads see them.
+# ORM changes are seen at flush; Core insert()/update()/delete() statements
+# (e.g. stock reservations) never flush, so they are caught as they execute.
+@event.listens_for(Session, "after_flush")
+def _flag_write(session, flush_context):
+    session.info["wrote"] = True
+
+@event.listens_for(Session, "do_orm_execute")
+def _flag_statement_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+@event.listens_for(Session, "after_commit")
+def _record_write(session):
+    key = session.info.get("client_key")
+    if key is not None and session.info.pop("wrote", False):
+        replica_router.mark_write(key)
+
+
 # Dependency to get DB session
-def get_session():
+def get_session(request: Request = None):
     with Session(engine) as session:
+        if request is not None:
+            session.info["client_key"] = client_key(request)
         yield session
+
+# Dependency to get a session for read-only routes (served by a replica when configured)
+def get_read_session(request: Request):
+    key = client_key(request)
+    if not replica_router.replicas or (key is not None and replica_router.is_sticky(key)):
+        with Session(engine) as session:
+            yield session
+        return
+
+    replica, connection = replica_router.connect()
+    try:
+        with Session(bind=connection) as session:
+            yield session
+    finally:
+        connection.close()
+        replica_router.release(replica)
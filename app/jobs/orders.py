@@ -0,0 +1,23 @@
+# app/jobs/orders.py
+from sqlmodel import Session
+
+from app.core.inventory import release_expired_reservations
+from app.core.queue import job_queue
+
+# -----------------------------
+# Job names enqueued by the order endpoints
+# -----------------------------
+RELEASE_EXPIRED_RESERVATIONS = "orders.release_expired"
+
+
+# -----------------------------
+# Handlers
+# -----------------------------
+@job_queue.register(RELEASE_EXPIRED_RESERVATIONS)
+def release_expired(session: Session):
+    """Return stock held by unpaid orders whose reservation window has passed.
+
+    Scheduled once per checkout, but each run sweeps every overdue order, so a
+    burst of checkouts is released by the first job and the rest are no-ops.
+    """
+    release_expired_reservations(session)
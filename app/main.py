@@ -2,11 +2,17 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 
 from app.api.auth import router as auth_router
 from app.api.products import router as products_router
-from app.db.base import create_db_and_tables
+from app.api.stream import router as stream_router
+from app.api.cart import router as cart_router
+from app.api.orders import router as orders_router
+from app.db.base import create_db_and_tables, add_missing_columns, sync_sequences
 from app.db.session import engine
+from app.core.queue import job_queue
+from app.core.events import catalog_stream
 
 
 # -----------------------------
@@ -20,12 +26,12 @@ def seed_products_if_empty():
     from app.models.product import Product
 
     sample_products = [
-        {"name": "Classic White T-Shirt", "description": "A comfortable, versatile white tee in high-quality cotton with a classic fit.", "price": 29.99, "category": "men", "image_url": "/images/products/men/mens-shirt-1.jpg", "in_stock": True},
-        {"name": "Blue Denim Jacket", "description": "A timeless blue denim jacket with durable construction and a classic button-up design.", "price": 89.99, "category": "men", "image_url": "/images/products/men/mens-shirt-2.jpg", "in_stock": True},
-        {"name": "Casual Polo Shirt", "description": "A stylish polo with a comfortable fit and breathable fabric for casual or semi-formal wear.", "price": 45.99, "category": "men", "image_url": "/images/products/men/mens-shirt-3.jpg", "in_stock": True},
-        {"name": "Floral Summer Dress", "description": "A light, flowing floral dress perfect for warm days and easy summer styling.", "price": 64.99, "category": "women", "image_url": "/images/products/women/womens-dress-1.jpg", "in_stock": True},
-        {"name": "Elegant Black Blouse", "description": "A refined black blouse that pairs effortlessly with both formal and casual outfits.", "price": 52.99, "category": "women", "image_url": "/images/products/women/womens-top-1.jpg", "in_stock": True},
-        {"name": "Knitted Wool Sweater", "description": "A cozy knitted wool sweater that keeps you warm without sacrificing style.", "price": 74.99, "category": "women", "image_url": "/images/products/women/womens-sweater-1.jpg", "in_stock": True},
+        {"name": "Classic White T-Shirt", "description": "A comfortable, versatile white tee in high-quality cotton with a classic fit.", "price": 29.99, "category": "men", "image_url": "/images/products/men/mens-shirt-1.jpg", "in_stock": True, "stock": 50},
+        {"name": "Blue Denim Jacket", "description": "A timeless blue denim jacket with durable construction and a classic button-up design.", "price": 89.99, "category": "men", "image_url": "/images/products/men/mens-shirt-2.jpg", "in_stock": True, "stock": 50},
+        {"name": "Casual Polo Shirt", "description": "A stylish polo with a comfortable fit and breathable fabric for casual or semi-formal wear.", "price": 45.99, "category": "men", "image_url": "/images/products/men/mens-shirt-3.jpg", "in_stock": True, "stock": 50},
+        {"name": "Floral Summer Dress", "description": "A light, flowing floral dress perfect for warm days and easy summer styling.", "price": 64.99, "category": "women", "image_url": "/images/products/women/womens-dress-1.jpg", "in_stock": True, "stock": 50},
+        {"name": "Elegant Black Blouse", "description": "A refined black blouse that pairs effortlessly with both formal and casual outfits.", "price": 52.99, "category": "women", "image_url": "/images/products/women/womens-top-1.jpg", "in_stock": True, "stock": 50},
+        {"name": "Knitted Wool Sweater", "description": "A cozy knitted wool sweater that keeps you warm without sacrificing style.", "price": 74.99, "category": "women", "image_url": "/images/products/women/womens-sweater-1.jpg", "in_stock": True, "stock": 50},
     ]
 
     with Session(engine) as session:
@@ -41,11 +47,17 @@ def seed_products_if_empty():
 # -----------------------------
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: create tables, then seed the catalog if it is empty
+    # Startup: create/upgrade tables, then seed the catalog if it is empty
     create_db_and_tables(engine)
+    add_missing_columns(engine)
     seed_products_if_empty()
+    sync_sequences(engine)
+    job_queue.start()
+    catalog_stream.start(asyncio.get_running_loop())
     yield
-    # Shutdown: Add cleanup logic here if needed
+    # Shutdown: let in-flight jobs finish; pending ones stay in the outbox
+    catalog_stream.stop()
+    job_queue.stop()
 
 
 # -----------------------------
@@ -73,7 +85,10 @@ app.add_middleware(
 # Include API routers
 # -----------------------------
 app.include_router(auth_router, prefix="/auth", tags=["authentication"])
+app.include_router(stream_router, prefix="/products", tags=["products"])
 app.include_router(products_router, prefix="/products", tags=["products"])
+app.include_router(cart_router, prefix="/cart", tags=["cart"])
+app.include_router(orders_router, prefix="/orders", tags=["orders"])
 
 
 # -----------------------------
@@ -90,3 +105,11 @@ def read_root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+
+# -----------------------------
+# Background job queue metrics (depth, lag, retries)
+# -----------------------------
+@app.get("/metrics/jobs")
+def job_metrics():
+    return job_queue.stats()
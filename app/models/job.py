@@ -0,0 +1,17 @@
+# app/models/job.py
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime
+
+class Job(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str = Field(index=True)
+    payload: str = "{}"  # JSON-encoded arguments for the handler
+    status: str = Field(default="pending", index=True)  # pending, running, failed
+    attempts: int = 0
+    max_attempts: int = 5
+    run_after: datetime = Field(default_factory=datetime.utcnow, index=True)
+    locked_until: Optional[datetime] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+    last_error: Optional[str] = None
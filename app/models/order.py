@@ -0,0 +1,28 @@
+# app/models/order.py
+from sqlalchemy import UniqueConstraint
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime
+
+class CartItem(SQLModel, table=True):
+    __table_args__ = (UniqueConstraint("user_id", "product_id"),)  # one row per product per cart
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id", index=True)
+    product_id: int = Field(index=True)
+    quantity: int
+
+class Order(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id", index=True)
+    status: str = Field(default="reserved", index=True)  # reserved, confirmed, cancelled, expired
+    total: float = 0
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: datetime = Field(index=True)  # reserved stock is released after this
+
+class OrderItem(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    order_id: int = Field(foreign_key="order.id", index=True)
+    product_id: int = Field(index=True)  # no FK: order history outlives deleted products
+    quantity: int
+    unit_price: float
@@ -8,5 +8,8 @@ class Product(SQLModel, table=True):
     description: Optional[str] = None
     price: float
     in_stock: bool = True
+    # Units available; reserved atomically at checkout. The server default lets
+    # the column be added to existing tables (see app/db/base.py).
+    stock: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
     image_url: Optional[str] = None
     category: str = Field(default="general")  # men, women, general
@@ -0,0 +1,29 @@
+# app/schemas/order.py
+from typing import List
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+# Used when adding a product to the cart (input)
+class CartItemCreate(BaseModel):
+    product_id: int
+    quantity: int = Field(gt=0)
+
+# Used when sending cart contents to clients
+class CartItemPublic(BaseModel):
+    product_id: int
+    quantity: int
+
+# Used when sending order lines to clients
+class OrderItemPublic(BaseModel):
+    product_id: int
+    quantity: int
+    unit_price: float
+
+# Used when sending orders to clients
+class OrderPublic(BaseModel):
+    id: int
+    status: str
+    total: float
+    created_at: datetime
+    expires_at: datetime
+    items: List[OrderItemPublic]
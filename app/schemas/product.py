@@ -1,6 +1,6 @@
 # app/schemas/product.py
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 # Used when sending product data to clients
 class ProductPublic(BaseModel):
@@ -9,6 +9,7 @@ class ProductPublic(BaseModel):
     description: Optional[str] = None
     price: float
     in_stock: bool
+    stock: int
     image_url: Optional[str] = None
     category: str
 
@@ -17,6 +18,7 @@ class ProductCreate(BaseModel):
     name: str
     description: Optional[str] = None
     price: float
-    in_stock: Optional[bool] = True
+    in_stock: Optional[bool] = None  # only used when stock is omitted
+    stock: Optional[int] = Field(default=None, ge=0)
     image_url: Optional[str] = None
     category: str = "general"
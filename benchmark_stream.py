@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for the live catalog stream: many idle SSE clients.
+
+Starts the API in a uvicorn subprocess, opens N idle /products/stream
+connections and reports how much the server's resident memory (RSS) grew per
+connection. Linux only (reads /proc); raise `ulimit -n` above N first.
+
+    python benchmark_stream.py --connections 10000
+"""
+import argparse
+import asyncio
+import os
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connections", type=int, default=1000, help="idle SSE clients to open (default: 1000)")
+    parser.add_argument("--port", type=int, default=8799, help="port for the server under test (default: 8799)")
+    parser.add_argument("--hold", type=float, default=5.0, help="seconds to keep clients idle before measuring (default: 5)")
+    return parser.parse_args()
+
+
+def rss_kb(pid: int) -> int:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    raise RuntimeError("VmRSS not found")
+
+
+def wait_for_port(port: int, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server did not start on port {port}")
+
+
+async def open_client(port: int):
+    """Open one SSE stream and wait for its first line; returns the open connection."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET /products/stream HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\nAccept: text/event-stream\r\n\r\n".encode())
+    await writer.drain()
+    await reader.readuntil(b"retry: 3000")
+    return reader, writer
+
+
+async def open_clients(port: int, count: int):
+    clients = []
+    for start in range(0, count, 200):  # stay under the server's listen backlog
+        clients.extend(await asyncio.gather(*(open_client(port) for _ in range(start, min(count, start + 200)))))
+    return clients
+
+
+def run_benchmark(args):
+    # Client sockets count against this process's file limit too
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < args.connections + 100:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(hard, args.connections + 100), hard))
+
+    db_dir = tempfile.mkdtemp(prefix="stream-bench-")
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{os.path.join(db_dir, 'bench.db')}",
+        STREAM_HEARTBEAT_SECONDS="3600",  # measure idle connections, not heartbeats
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port),
+         "--log-level", "warning", "--backlog", "4096"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port(args.port)
+        time.sleep(1)  # let startup allocations settle
+
+        async def measure():
+            # Warm up the code paths so the baseline includes them
+            warm = await open_clients(args.port, 10)
+            for _, writer in warm:
+                writer.close()
+            await asyncio.sleep(1)
+            baseline = rss_kb(server.pid)
+
+            started = time.perf_counter()
+            clients = await open_clients(args.port, args.connections)
+            opened = time.perf_counter() - started
+            await asyncio.sleep(args.hold)
+            loaded = rss_kb(server.pid)
+
+            for _, writer in clients:
+                writer.close()
+            return baseline, loaded, opened
+
+        baseline, loaded, opened = asyncio.run(measure())
+    finally:
+        server.kill()
+        server.wait()
+
+    per_connection = (loaded - baseline) / args.connections
+    print(f"Connections:   {args.connections} idle SSE clients (opened in {opened:.1f}s)")
+    print(f"Server RSS:    {baseline / 1024:.1f} MB -> {loaded / 1024:.1f} MB")
+    print(f"Per client:    {per_connection:.1f} KB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_benchmark(parse_args()))
@@ -21,6 +21,7 @@ export interface Product {
   description?: string;
   price: number;
   in_stock: boolean;
+  stock: number;
   image_url?: string;
   category: string;
 }
@@ -30,6 +31,7 @@ export interface ProductCreate {
   description?: string;
   price: number;
   in_stock?: boolean;
+  stock?: number;
   image_url?: string;
   category?: string;
 }
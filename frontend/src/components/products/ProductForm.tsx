@@ -14,7 +14,7 @@ const ProductForm: React.FC = () => {
     name: '',
     description: '',
     price: 0,
-    in_stock: true,
+    stock: 0,
     image_url: '',
     category: CATEGORIES.GENERAL,
   });
@@ -34,7 +34,7 @@ const ProductForm: React.FC = () => {
         name: data.name,
         description: data.description || '',
         price: data.price,
-        in_stock: data.in_stock,
+        stock: data.stock,
         image_url: data.image_url || '',
         category: data.category || CATEGORIES.GENERAL,
       });
@@ -59,6 +59,11 @@ const ProductForm: React.FC = () => {
     setFormData((prev) => ({ ...prev, price: Number.isNaN(v) ? 0 : v }));
   };
 
+  const handleStockChange = (e: React.ChangeEvent<HTMLInputElement>) => {
+    const v = parseInt(e.target.value, 10);
+    setFormData((prev) => ({ ...prev, stock: Number.isNaN(v) ? 0 : Math.max(0, v) }));
+  };
+
   const validate = (): boolean => {
     if (!formData.name.trim()) {
       setError('Product name is required');
@@ -199,17 +204,24 @@ const ProductForm: React.FC = () => {
               </p>
             </div>
 
-            <div className="field" style={{ display: 'flex', alignItems: 'center', gap: '0.75rem', padding: '1rem', background: 'var(--bg)', borderRadius: 'var(--radius-sm)', border: '1px solid var(--gray-light)' }}>
+            <div className="field">
+              <label htmlFor="stock">Units in stock *</label>
               <input
-                type="checkbox"
-                id="in_stock"
-                name="in_stock"
-                checked={formData.in_stock}
-                onChange={handleChange}
+                type="number"
+                id="stock"
+                name="stock"
+                className="input"
+                value={formData.stock}
+                onChange={handleStockChange}
+                min={0}
+                step={1}
+                required
                 disabled={loading}
-                style={{ width: '1.25rem', height: '1.25rem', accentColor: 'var(--primary)' }}
+                placeholder="0"
               />
-              <label htmlFor="in_stock" style={{ marginBottom: 0, cursor: 'pointer' }}>Product is in stock</label>
+              <p style={{ fontSize: '0.8rem', color: 'var(--gray)', marginTop: '0.25rem' }}>
+                The product shows as out of stock at 0.
+              </p>
             </div>
 
             <div style={{ display: 'flex', flexWrap: 'wrap', gap: '0.75rem', marginTop: '1.5rem', paddingTop: '1.5rem', borderTop: '1px solid var(--gray-light)' }}>
@@ -11,6 +11,8 @@ from sqlalchemy.orm import sessionmaker
 # Add the app directory to the path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from app.core.config import settings
+
 def migrate_data():
     """Migrate data from SQLite to PostgreSQL"""
 
@@ -34,8 +36,12 @@ def migrate_data():
         users = sqlite_cursor.fetchall()
         print(f"Found {len(users)} users in SQLite")
 
-        # Get all products
-        sqlite_cursor.execute('SELECT id, name, description, price, in_stock, image_url, category FROM product')
+        # Get all products (databases created before stock counts existed have no
+        # stock column; products that were in stock get the default count)
+        sqlite_cursor.execute('PRAGMA table_info(product)')
+        has_stock = any(column[1] == 'stock' for column in sqlite_cursor.fetchall())
+        stock_column = 'stock' if has_stock else f'CASE WHEN in_stock THEN {settings.DEFAULT_STOCK} ELSE 0 END'
+        sqlite_cursor.execute(f'SELECT id, name, description, price, in_stock, {stock_column}, image_url, category FROM product')
         products = sqlite_cursor.fetchall()
         print(f"Found {len(products)} products in SQLite")
 
@@ -63,15 +69,16 @@ def migrate_data():
 
         # Insert products
         for product in products:
-            product_id, name, description, price, in_stock, image_url, category = product
+            product_id, name, description, price, in_stock, stock, image_url, category = product
             postgres_session.execute(
-                text('INSERT INTO product (id, name, description, price, in_stock, image_url, category) VALUES (:id, :name, :description, :price, :in_stock, :image_url, :category)'),
+                text('INSERT INTO product (id, name, description, price, in_stock, stock, image_url, category) VALUES (:id, :name, :description, :price, :in_stock, :stock, :image_url, :category)'),
                 {
                     'id': product_id,
                     'name': name,
                     'description': description,
                     'price': price,
-                    'in_stock': bool(in_stock),
+                    'in_stock': stock > 0,  # derived from stock
+                    'stock': stock,
                     'image_url': image_url,
                     'category': category
                 }
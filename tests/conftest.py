@@ -0,0 +1,48 @@
+# tests/conftest.py
+import itertools
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Settings are read at import time, so point the app at a throwaway database
+# (and run jobs inline) before anything from `app` is imported
+_db_dir = tempfile.mkdtemp(prefix="products-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'primary.db')}"
+os.environ["DATABASE_REPLICA_URLS"] = ""
+os.environ["JOBS_EAGER"] = "true"
+os.environ["EVENT_BROKER"] = "memory"
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.session import engine
+from app.main import app
+
+engine.echo = False
+
+_user_ids = itertools.count(1)
+
+
+@pytest.fixture(scope="session")
+def db_dir():
+    return _db_dir
+
+
+@pytest.fixture(scope="session")
+def client():
+    # Entering the client runs the lifespan: tables, seed catalog, stream hub
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def auth_headers(client):
+    """Register a fresh user and return their Authorization header."""
+    username = f"user{next(_user_ids)}"
+    client.post("/auth/register", json={
+        "username": username, "email": f"{username}@example.com", "password": "secret123"
+    })
+    response = client.post("/auth/login", data={"username": username, "password": "secret123"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
@@ -0,0 +1,30 @@
+# tests/test_orders.py
+from sqlmodel import Session
+
+from app.db.session import engine
+from app.models.order import CartItem
+
+
+def test_deleting_a_product_removes_it_from_carts(client, auth_headers):
+    product = client.post("/products/", json={"name": "Limited", "price": 5.0, "stock": 5}, headers=auth_headers).json()
+    client.put("/cart/items", json={"product_id": product["id"], "quantity": 1}, headers=auth_headers)
+    client.put("/cart/items", json={"product_id": 2, "quantity": 1}, headers=auth_headers)
+
+    client.delete(f"/products/{product['id']}", headers=auth_headers)
+    assert [item["product_id"] for item in client.get("/cart/", headers=auth_headers).json()] == [2]
+
+    order = client.post("/orders/checkout", headers=auth_headers)
+    assert order.status_code == 200
+    assert [item["product_id"] for item in order.json()["items"]] == [2]
+
+
+def test_checkout_names_a_product_that_no_longer_exists(client, auth_headers):
+    # e.g. a cart row left behind before deletes cleaned up carts
+    user_id = client.get("/auth/me", headers=auth_headers).json()["id"]
+    with Session(engine) as session:
+        session.add(CartItem(user_id=user_id, product_id=999999, quantity=1))
+        session.commit()
+
+    response = client.post("/orders/checkout", headers=auth_headers)
+    assert response.status_code == 409
+    assert response.json()["detail"].startswith("Product 999999 is no longer available")
@@ -0,0 +1,188 @@
+# tests/test_queue.py
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import Session, delete, select
+
+from app.core.queue import job_queue
+from app.db.session import engine
+from app.models.job import Job
+
+# conftest sets JOBS_EAGER=true: jobs run in the committing thread
+
+
+@pytest.fixture(autouse=True)
+def empty_outbox(client, monkeypatch):
+    # Start every test from an empty outbox and fresh counters (client creates the tables)
+    with Session(engine) as session:
+        session.exec(delete(Job))
+        session.commit()
+    monkeypatch.setattr(job_queue, "_counters", {"processed": 0, "retried": 0, "failed": 0})
+    yield
+    with Session(engine) as session:
+        session.exec(delete(Job))
+        session.commit()
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    """Register a test handler; returns the list of payloads it was called with."""
+    def register(name, func=None):
+        calls = []
+        def record(session, **payload):
+            calls.append(payload)
+            if func is not None:
+                func(**payload)
+        monkeypatch.setitem(job_queue.handlers, name, record)
+        return calls
+    return register
+
+
+def enqueue(name, **payload):
+    with Session(engine) as session:
+        job_queue.enqueue(session, name, **payload)
+        session.commit()
+
+
+def add_jobs(*jobs):
+    """Insert outbox rows directly, without triggering an eager run."""
+    with Session(engine) as session:
+        session.add_all(jobs)
+        session.commit()
+
+
+def jobs():
+    with Session(engine) as session:
+        return session.exec(select(Job).order_by(Job.id)).all()
+
+
+def make_due():
+    with Session(engine) as session:
+        for job in session.exec(select(Job)).all():
+            job.run_after = datetime.utcnow() - timedelta(seconds=1)
+            session.add(job)
+        session.commit()
+
+
+def test_eager_job_runs_on_commit(handler):
+    calls = handler("test.ok")
+    enqueue("test.ok", value=1)
+    assert calls == [{"value": 1}]
+    assert jobs() == []
+    assert job_queue.stats()["counters"]["processed"] == 1
+
+
+def test_failing_job_backs_off_then_fails(handler, monkeypatch):
+    def boom(**payload):
+        raise RuntimeError("boom")
+    calls = handler("test.boom", boom)
+    monkeypatch.setattr(job_queue, "max_attempts", 3)
+
+    enqueue("test.boom")
+    for attempt, backoff in ((1, 2), (2, 4)):
+        [job] = jobs()
+        assert (job.status, job.attempts) == ("pending", attempt)
+        assert "boom" in job.last_error
+        delay = (job.run_after - datetime.utcnow()).total_seconds()
+        assert backoff - 1 < delay <= backoff
+        # Not due yet: nothing runs until the backoff has passed
+        assert job_queue.run_pending() == 0
+        make_due()
+        assert job_queue.run_pending() == 1
+
+    [job] = jobs()
+    assert (job.status, job.attempts) == ("failed", 3)
+    assert job.finished_at is not None
+    assert len(calls) == 3
+    stats = job_queue.stats()
+    assert (stats["depth"], stats["failed"]) == (0, 1)
+    assert stats["counters"] == {"processed": 0, "retried": 2, "failed": 1}
+
+
+def test_expired_lease_is_reclaimed(handler):
+    calls = handler("test.ok")
+    now = datetime.utcnow()
+    add_jobs(
+        Job(name="test.ok", payload='{"worker": "dead"}', status="running", attempts=1,
+            locked_until=now - timedelta(seconds=1)),
+        Job(name="test.ok", payload='{"worker": "alive"}', status="running", attempts=1,
+            locked_until=now + timedelta(minutes=5)),
+    )
+    assert job_queue.run_pending() == 1
+    assert calls == [{"worker": "dead"}]
+    [job] = jobs()
+    assert job.status == "running" and job.locked_until > now
+
+
+def test_concurrent_claims_never_share_a_job():
+    add_jobs(*[Job(name="test.ok") for _ in range(40)])
+    claimed = []
+    start = threading.Barrier(4)
+
+    def claim():
+        start.wait()
+        while True:
+            job_ids = job_queue._claim(5)
+            if not job_ids:
+                return
+            claimed.extend(job_ids)
+
+    threads = [threading.Thread(target=claim) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(claimed) == 40
+    assert len(set(claimed)) == 40
+    assert all(job.status == "running" and job.attempts == 1 for job in jobs())
+
+
+def test_rollback_discards_enqueued_job(handler):
+    calls = handler("test.ok")
+    with Session(engine) as session:
+        job_queue.enqueue(session, "test.ok")
+        session.rollback()
+        assert "jobs_enqueued" not in session.info
+    assert jobs() == []
+    assert calls == []
+
+
+def test_unknown_job_name_is_rejected():
+    with Session(engine) as session, pytest.raises(ValueError):
+        job_queue.enqueue(session, "test.missing")
+
+
+def test_concurrent_eager_commits_each_run_their_own_job(handler):
+    # One thread is still inside a slow job when another commits new work:
+    # the second thread must run its job before its commit returns
+    release = threading.Event()
+    slow_calls = handler("test.slow", lambda **payload: release.wait(5))
+    fast_calls = handler("test.fast")
+    slow = threading.Thread(target=enqueue, args=("test.slow",))
+    slow.start()
+    try:
+        while not slow_calls:
+            threading.Event().wait(0.01)
+        enqueue("test.fast")
+        assert fast_calls == [{}]
+    finally:
+        release.set()
+        slow.join()
+    assert jobs() == []
+
+
+def test_metrics_report_depth_and_lag(client):
+    now = datetime.utcnow()
+    add_jobs(
+        Job(name="test.ok", run_after=now - timedelta(seconds=30)),
+        Job(name="test.ok", run_after=now - timedelta(seconds=5)),
+        Job(name="test.ok", run_after=now + timedelta(minutes=10)),  # delayed, not late
+        Job(name="test.ok", status="failed"),
+    )
+    metrics = client.get("/metrics/jobs").json()
+    assert metrics["depth"] == 3
+    assert metrics["failed"] == 1
+    assert 30 <= metrics["lag_seconds"] < 40
+    assert metrics["workers"] == job_queue.workers
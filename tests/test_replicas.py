@@ -0,0 +1,133 @@
+# tests/test_replicas.py
+import os
+import time
+
+import pytest
+from sqlmodel import SQLModel, create_engine
+
+from app.db import session as db_session
+from app.db.session import ReplicaRouter, engine
+
+
+def sqlite_engine(path):
+    return create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+
+
+@pytest.fixture
+def replicas(tmp_path):
+    """Two empty replica files with the schema in place."""
+    engines = [sqlite_engine(tmp_path / "replica1.db"), sqlite_engine(tmp_path / "replica2.db")]
+    for replica in engines:
+        SQLModel.metadata.create_all(replica)
+    return engines
+
+
+@pytest.fixture
+def unreachable(tmp_path):
+    # SQLite can't create a file in a directory that doesn't exist
+    return sqlite_engine(tmp_path / "missing" / "replica.db")
+
+
+def connect_and_release(router):
+    replica, connection = router.connect()
+    connection.close()
+    router.release(replica)
+    return replica
+
+
+# -----------------------------
+# Selection
+# -----------------------------
+def test_round_robin_alternates_between_replicas(replicas):
+    router = ReplicaRouter(engine, replicas)
+    picked = [connect_and_release(router) for _ in range(4)]
+    assert picked[0] is not picked[1]
+    assert picked == [picked[0], picked[1]] * 2
+
+
+def test_least_loaded_skips_busy_replica(replicas):
+    router = ReplicaRouter(engine, replicas, strategy="least_loaded")
+    busy, held = router.connect()
+    try:
+        idle = [r for r in replicas if r is not busy][0]
+        assert [connect_and_release(router) for _ in range(3)] == [idle] * 3
+    finally:
+        held.close()
+        router.release(busy)
+    assert {connect_and_release(router) for _ in range(2)} == set(replicas)
+
+
+def test_unknown_strategy_is_rejected(replicas):
+    with pytest.raises(ValueError):
+        ReplicaRouter(engine, replicas, strategy="random")
+
+
+# -----------------------------
+# Failover
+# -----------------------------
+def test_unreachable_replica_fails_over_and_is_skipped(replicas, unreachable):
+    router = ReplicaRouter(engine, [unreachable, replicas[0]], retry_seconds=60)
+    assert [connect_and_release(router) for _ in range(3)] == [replicas[0]] * 3
+    assert router._candidates() == [replicas[0]]
+
+
+def test_all_replicas_down_falls_back_to_primary(unreachable):
+    router = ReplicaRouter(engine, [unreachable])
+    assert connect_and_release(router) is engine
+
+
+def test_failed_replica_is_retried_after_retry_window(tmp_path, replicas):
+    path = tmp_path / "late" / "replica.db"
+    late = sqlite_engine(path)
+    router = ReplicaRouter(engine, [late], retry_seconds=0.05)
+    assert connect_and_release(router) is engine
+
+    os.makedirs(path.parent)
+    time.sleep(0.1)
+    assert connect_and_release(router) is late
+
+
+# -----------------------------
+# Read-your-writes stickiness
+# -----------------------------
+def test_sticky_window_expires(replicas):
+    router = ReplicaRouter(engine, replicas, sticky_seconds=0.05)
+    router.mark_write("1")
+    assert router.is_sticky("1")
+    assert not router.is_sticky("2")
+    time.sleep(0.1)
+    assert not router.is_sticky("1")
+
+
+@pytest.fixture
+def routed(client, replicas, monkeypatch):
+    """Serve catalog reads from an empty replica, so a 404 means "read from a replica"."""
+    router = ReplicaRouter(engine, replicas[:1], sticky_seconds=60)
+    monkeypatch.setattr(db_session, "replica_router", router)
+    return router
+
+
+def test_reads_go_to_replica(client, routed):
+    assert client.get("/products/1").status_code == 404
+    assert client.get("/products/1", headers={"Authorization": "Bearer not-a-token"}).status_code == 404
+
+
+def test_core_update_pins_writer_to_primary(client, routed, auth_headers):
+    # Checkout, confirm and cancel change stock with Core UPDATEs, not ORM flushes
+    client.put("/cart/items", json={"product_id": 1, "quantity": 1}, headers=auth_headers)
+    order = client.post("/orders/checkout", headers=auth_headers).json()
+    routed._recent_writers.clear()
+
+    response = client.post(f"/orders/{order['id']}/cancel", headers=auth_headers)
+    assert response.json()["status"] == "cancelled"
+    assert client.get("/products/1", headers=auth_headers).status_code == 200
+
+
+def test_stickiness_is_per_user(client, routed, auth_headers):
+    client.put("/cart/items", json={"product_id": 1, "quantity": 1}, headers=auth_headers)
+    assert client.get("/products/1", headers=auth_headers).status_code == 200
+
+    # Neither anonymous clients nor other users are pinned by someone else's write
+    assert client.get("/products/1").status_code == 404
+    client.post("/auth/register", json={"username": "anon", "email": "anon@example.com", "password": "x"})
+    assert client.get("/products/1").status_code == 404
@@ -0,0 +1,148 @@
+# tests/test_stream.py
+import asyncio
+import time
+
+import pytest
+from sqlmodel import Session
+
+from app.core.events import catalog_stream, from_reference, merge_diffs, to_reference
+from app.db.session import engine
+
+
+def update(product_id, category="men", **changes):
+    return {"categories": [category], "diff": {"op": "update", "id": product_id, "category": category, "changes": changes}}
+
+
+@pytest.fixture
+def stream(monkeypatch):
+    """The app's hub with no coalescing delay, a tiny buffer and a fast heartbeat."""
+    monkeypatch.setattr(catalog_stream, "coalesce_seconds", 0)
+    monkeypatch.setattr(catalog_stream, "max_pending", 3)
+    monkeypatch.setattr(catalog_stream, "heartbeat_seconds", 0.05)
+    return catalog_stream
+
+
+def next_batches(stream, subscriber, count):
+    async def collect():
+        batches = stream.batches(subscriber)
+        return [await anext(batches) for _ in range(count)]
+    return asyncio.run(collect())
+
+
+# -----------------------------
+# merge_diffs
+# -----------------------------
+def test_merge_update_into_create():
+    create = {"op": "create", "id": 1, "category": "men", "product": {"price": 1.0, "stock": 5}}
+    merged = merge_diffs(create, update(1, "women", price=2.0)["diff"])
+    assert merged == {"op": "create", "id": 1, "category": "women", "product": {"price": 2.0, "stock": 5}}
+
+
+def test_merge_updates_keep_latest_values():
+    merged = merge_diffs(update(1, price=1.0, stock=5)["diff"], update(1, stock=4)["diff"])
+    assert merged["changes"] == {"price": 1.0, "stock": 4}
+
+
+def test_delete_replaces_pending_diff():
+    delete = {"op": "delete", "id": 1, "category": "men"}
+    assert merge_diffs(update(1, price=1.0)["diff"], delete) == delete
+
+
+# -----------------------------
+# Fan-out, coalescing and backpressure
+# -----------------------------
+def test_fan_out_filters_by_category(stream):
+    everything, men, women = stream.subscribe(), stream.subscribe(["men"]), stream.subscribe(["women"])
+    try:
+        stream._fan_out(update(1, "men", price=1.0))
+        assert list(everything.pending) == [1]
+        assert list(men.pending) == [1]
+        assert women.pending == {}
+
+        # A product moving between categories reaches both sides
+        moved = {"op": "update", "id": 2, "category": "women", "changes": {"category": "women"}}
+        stream._fan_out({"categories": ["men", "women"], "diff": moved})
+        assert 2 in men.pending and 2 in women.pending
+    finally:
+        for subscriber in (everything, men, women):
+            stream.unsubscribe(subscriber)
+    assert stream._by_category == {}
+
+
+def test_burst_coalesces_into_one_diff(stream):
+    subscriber = stream.subscribe()
+    try:
+        for stock in (5, 4, 3):
+            stream._fan_out(update(1, stock=stock))
+        stream._fan_out(update(2, price=9.0))
+        [batch] = next_batches(stream, subscriber, 1)
+    finally:
+        stream.unsubscribe(subscriber)
+    assert batch["event"] == "products"
+    assert [diff["changes"] for diff in batch["data"]] == [{"stock": 3}, {"price": 9.0}]
+
+
+def test_slow_client_is_told_to_resync(stream):
+    subscriber = stream.subscribe()
+    try:
+        for product_id in range(1, 6):  # more products than max_pending
+            stream._fan_out(update(product_id, price=1.0))
+        assert subscriber.overflowed and subscriber.pending == {}
+        stream._fan_out(update(6, price=1.0))  # dropped: the client refetches anyway
+        assert subscriber.pending == {}
+
+        [batch] = next_batches(stream, subscriber, 1)
+        assert batch == {"event": "resync", "data": {}}
+
+        # Back to normal diffs afterwards
+        stream._fan_out(update(7, price=2.0))
+        [batch] = next_batches(stream, subscriber, 1)
+        assert batch["data"] == [update(7, price=2.0)["diff"]]
+    finally:
+        stream.unsubscribe(subscriber)
+
+
+def test_idle_subscriber_gets_heartbeats(stream):
+    subscriber = stream.subscribe()
+    try:
+        assert next_batches(stream, subscriber, 2) == [None, None]
+    finally:
+        stream.unsubscribe(subscriber)
+
+
+# -----------------------------
+# References (brokers with a payload limit)
+# -----------------------------
+def test_reference_round_trip_loads_current_values(client):
+    message = update(1, stock=1, description="x" * 10000)
+    reference = to_reference(message)
+    assert reference["diff"] == {"op": "update", "id": 1, "category": "men", "fields": ["description", "stock"]}
+
+    with Session(engine) as session:
+        diff = from_reference(session, reference)["diff"]
+    product = client.get("/products/1").json()
+    assert diff["changes"] == {"description": product["description"], "stock": product["stock"]}
+
+
+def test_reference_to_missing_product_becomes_delete(client):
+    with Session(engine) as session:
+        diff = from_reference(session, to_reference(update(999999, price=1.0)))["diff"]
+    assert diff == {"op": "delete", "id": 999999, "category": "men"}
+
+
+# -----------------------------
+# WebSocket endpoint
+# -----------------------------
+def test_websocket_receives_committed_diffs_for_its_categories(client, auth_headers):
+    product = client.get("/products/4").json()  # a women's product
+    with client.websocket_connect("/products/stream/ws?category=women") as websocket:
+        client.put("/products/1", json={"name": "Men's tee", "price": 1.0, "category": "men"}, headers=auth_headers)
+        client.put("/products/4", json={**product, "price": 12.5}, headers=auth_headers)
+        message = websocket.receive_json()
+    assert message["event"] == "products"
+    assert [(diff["id"], diff["changes"]) for diff in message["data"]] == [(4, {"price": 12.5})]
+    # Closing the socket unsubscribes straight away, not at the next heartbeat
+    deadline = time.monotonic() + 1
+    while catalog_stream._by_category and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert catalog_stream._by_category == {}